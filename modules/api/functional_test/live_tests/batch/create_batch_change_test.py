@@ -1,6 +1,9 @@
+import pytest
 from hamcrest import *
 from utils import *
 
+pytestmark = pytest.mark.usefixtures('clean_shared_zone_test_context')
+
 def does_not_contain(x):
     is_not(contains(x))
 
@@ -1,19 +1,58 @@
 import pytest
 
 @pytest.fixture(scope="session")
-def shared_zone_test_context(request):
+def lazy_shared_zone_test_context(request):
+    """
+    The session wide shared groups; each shared zone is only created the first time a test reads it
+    """
     from shared_zone_test_context import SharedZoneTestContext
 
     ctx = SharedZoneTestContext()
 
     def fin():
-        ctx.tear_down()
+        try:
+            ctx.tear_down()
+        finally:
+            ctx.release_lock()
 
     request.addfinalizer(fin)
 
     return ctx
 
 
+@pytest.fixture(scope="module")
+def shared_zone_test_context(lazy_shared_zone_test_context, request):
+    """
+    The session wide shared zone context with every shared zone created up front.
+
+    A module that only reads a few of the shared zones can set LAZY_SHARED_ZONES = True at module level,
+    then only the zones its tests actually read get created
+    """
+    if not getattr(request.module, 'LAZY_SHARED_ZONES', False):
+        lazy_shared_zone_test_context.warm()
+
+    return lazy_shared_zone_test_context
+
+
+@pytest.fixture(scope="module")
+def clean_shared_zone_test_context(request, shared_zone_test_context):
+    """
+    The session wide shared zone context; any record sets the module adds to the shared zones are removed
+    once the module completes, without rebuilding the zones themselves.
+
+    A module that adds record sets to the shared zones opts in for all of its tests with
+    pytestmark = pytest.mark.usefixtures('clean_shared_zone_test_context')
+    """
+    snapshot = shared_zone_test_context.snapshot_records()
+
+    def fin():
+        shared_zone_test_context.reset_records_only(snapshot)
+
+    request.addfinalizer(fin)
+
+    return shared_zone_test_context
+
+
 @pytest.fixture(scope="session")
 def zone_history_context(request):
     from zone_history_context import ZoneHistoryContext
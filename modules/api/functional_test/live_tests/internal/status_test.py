@@ -7,6 +7,8 @@ from vinyldns_python import VinylDNSClient
 from vinyldns_context import VinylDNSTestContext
 from utils import *
 
+LAZY_SHARED_ZONES = True
+
 
 def test_get_status_success(shared_zone_test_context):
     """
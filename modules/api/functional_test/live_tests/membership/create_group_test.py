@@ -6,6 +6,8 @@ from hamcrest import *
 from vinyldns_python import VinylDNSClient
 from vinyldns_context import VinylDNSTestContext
 
+LAZY_SHARED_ZONES = True
+
 def test_create_group_success(shared_zone_test_context):
     """
     Tests that creating a group works
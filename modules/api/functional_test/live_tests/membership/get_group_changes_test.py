@@ -5,6 +5,8 @@ from hamcrest import *
 
 from vinyldns_python import VinylDNSClient
 
+LAZY_SHARED_ZONES = True
+
 @pytest.fixture(scope="module")
 def group_activity_context(request, shared_zone_test_context):
     client = shared_zone_test_context.ok_vinyldns_client
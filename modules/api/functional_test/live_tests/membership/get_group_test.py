@@ -4,6 +4,8 @@ import json
 from hamcrest import *
 from vinyldns_python import VinylDNSClient
 
+LAZY_SHARED_ZONES = True
+
 
 def test_get_group_success(shared_zone_test_context):
     """
@@ -5,6 +5,8 @@ from hamcrest import *
 
 from vinyldns_python import VinylDNSClient
 
+LAZY_SHARED_ZONES = True
+
 
 def test_list_group_members_success(shared_zone_test_context):
     """
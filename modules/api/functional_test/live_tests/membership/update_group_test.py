@@ -5,6 +5,8 @@ import time
 from hamcrest import *
 from vinyldns_python import VinylDNSClient
 
+LAZY_SHARED_ZONES = True
+
 
 def test_update_group_success(shared_zone_test_context):
     """
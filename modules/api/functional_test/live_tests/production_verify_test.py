@@ -10,6 +10,8 @@ from vinyldns_python import VinylDNSClient
 from test_data import TestData
 from dns.resolver import *
 
+LAZY_SHARED_ZONES = True
+
 
 def test_verify_production(shared_zone_test_context):
     """
@@ -5,6 +5,8 @@ from vinyldns_python import VinylDNSClient
 from test_data import TestData
 from dns.resolver import *
 
+pytestmark = pytest.mark.usefixtures('clean_shared_zone_test_context')
+
 
 def test_create_recordset_with_dns_verify(shared_zone_test_context):
     """
@@ -7,6 +7,8 @@ from vinyldns_python import VinylDNSClient
 from test_data import TestData
 import time
 
+pytestmark = pytest.mark.usefixtures('clean_shared_zone_test_context')
+
 
 @pytest.mark.parametrize('record_name,test_rs', TestData.FORWARD_RECORDS)
 def test_delete_recordset_forward_record_types(shared_zone_test_context, record_name, test_rs):
@@ -5,6 +5,8 @@ from utils import *
 from hamcrest import *
 from vinyldns_python import VinylDNSClient
 
+LAZY_SHARED_ZONES = True
+
 def test_get_recordset_no_authorization(shared_zone_test_context):
     """
     Test getting a recordset without authorization
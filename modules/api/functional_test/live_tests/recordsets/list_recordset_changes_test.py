@@ -2,6 +2,8 @@ from hamcrest import *
 from utils import *
 from vinyldns_python import VinylDNSClient
 
+LAZY_SHARED_ZONES = True
+
 
 def check_changes_response(response, recordChanges=False, nextId=False, startFrom=False, maxItems=100):
     """
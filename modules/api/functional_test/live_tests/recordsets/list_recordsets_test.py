@@ -6,6 +6,8 @@ from hamcrest import *
 from vinyldns_python import VinylDNSClient
 from test_data import TestData
 
+LAZY_SHARED_ZONES = True
+
 
 class ListRecordSetsFixture():
     def __init__(self, shared_zone_test_context):
@@ -8,6 +8,8 @@ from test_data import TestData
 from vinyldns_context import VinylDNSTestContext
 import time
 
+pytestmark = pytest.mark.usefixtures('clean_shared_zone_test_context')
+
 
 def test_update_a_with_same_name_as_cname(shared_zone_test_context):
     """
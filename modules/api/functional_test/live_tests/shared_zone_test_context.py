@@ -1,237 +1,303 @@
+import os
+import errno
+import json
 import time
+import socket
+from concurrent.futures import ThreadPoolExecutor
+from future.utils import iteritems
+import requests
+from requests.adapters import HTTPAdapter
+from requests.compat import urljoin, urlparse
 from vinyldns_python import VinylDNSClient
 from vinyldns_context import VinylDNSTestContext
-from hamcrest import *
 from utils import *
 
+# both users talk to the same api, so let them share one keep-alive connection pool
+shared_session = VinylDNSClient.requests_retry_session(pool_connections=20, pool_maxsize=50)
+
+# the ok group as every tear down leaves it
+_OK_GROUP = {
+    'id': 'ok',
+    'name': 'ok',
+    'email': 'test@test.com',
+    'description': 'this is a description',
+    'members': [ { 'id': 'ok'} ],
+    'admins': [ { 'id': 'ok'} ]
+}
+
+# records the zones and groups built by a run so that a run which never got to tear down can be picked up again
+FIXTURE_FILE = os.path.join(os.path.dirname(os.path.realpath(__file__)), '.vinyldns_fixture.json')
+FIXTURE_LOCK_FILE = FIXTURE_FILE + '.lock'
+
+def read_lock_pid():
+    try:
+        with open(FIXTURE_LOCK_FILE) as f:
+            return int(f.read().strip())
+    except (IOError, ValueError):
+        return None
+
+
+def fixture_lock_holder():
+    """
+    The pid of another process, still running, that holds the fixture lock; None when the lock is free or
+    was left behind by an interrupted run
+    """
+    pid = read_lock_pid()
+    if pid is None or pid == os.getpid():
+        return None
+
+    try:
+        os.kill(pid, 0)
+    except OSError as e:
+        if e.errno != errno.EPERM:
+            return None
+
+    return pid
+
+
+def acquire_fixture_lock(attempts=10):
+    """
+    Claims the shared zones for this process, refusing to go on while another live run is using them.
+    The lock file is created exclusively, so of two runs starting together only one gets it; a lock left
+    behind by a run that is no longer alive is taken over
+    """
+    for attempt in range(attempts):
+        try:
+            fd = os.open(FIXTURE_LOCK_FILE, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except OSError as e:
+            if e.errno != errno.EEXIST:
+                raise
+        else:
+            with os.fdopen(fd, 'w') as f:
+                f.write(str(os.getpid()))
+            return
+
+        holder = fixture_lock_holder()
+        if holder is not None:
+            raise RuntimeError('The shared zones are in use by the test run in process {0}, wait for it to finish '
+                               'or remove {1} if that process is not a test run'.format(holder, FIXTURE_LOCK_FILE))
+
+        stale_pid = read_lock_pid()
+        if stale_pid is None:
+            # another run has only just created the lock and not written its pid yet, or just removed it
+            time.sleep(0.1)
+            continue
+
+        # the holder is gone, remove its lock unless another run has already taken it over
+        if read_lock_pid() == stale_pid:
+            try:
+                os.remove(FIXTURE_LOCK_FILE)
+            except OSError as e:
+                if e.errno != errno.ENOENT:
+                    raise
+
+    raise RuntimeError('Could not take the lock on the shared zones, remove {0} if no other test run is '
+                       'using them'.format(FIXTURE_LOCK_FILE))
+
+
+def release_fixture_lock():
+    """
+    Releases the fixture lock, provided this process is the one holding it
+    """
+    if read_lock_pid() == os.getpid():
+        os.remove(FIXTURE_LOCK_FILE)
+
+
+def resolve_ahead(host):
+    """
+    Looks up a host before it is needed so the resolver cache is warm for the first real request;
+    any failure is left for that request to report
+    """
+    try:
+        socket.getaddrinfo(host, None)
+    except socket.error:
+        pass
+
+
+def open_connection(session, url):
+    """
+    Makes a cheap unsigned request so the session's pool holds an established connection before the
+    first real request; any failure is left for that request to report.
+    The request is sent once, without the session's retries and backoff which would only slow down a run
+    against an unhealthy api, through an adapter that shares the session adapter's pools
+    """
+    pooled = session.get_adapter(url)
+    once = HTTPAdapter(max_retries=0)
+    once.poolmanager = pooled.poolmanager
+    once.proxy_manager = pooled.proxy_manager
+
+    warm_up = requests.Session()
+    warm_up.verify, warm_up.cert, warm_up.proxies, warm_up.trust_env = \
+        session.verify, session.cert, session.proxies, session.trust_env
+    warm_up.mount(urlparse(url).scheme + '://', once)
+    try:
+        warm_up.get(urljoin(url, '/health'), timeout=2)
+    except requests.RequestException:
+        pass
+
+
+# attribute, zone name, shared, owning user, connection name, acl rules
+ZONE_SPECS = [
+    ('ok_zone', 'ok.', False, 'ok', 'ok.', None),
+    ('dummy_zone', 'dummy.', False, 'dummy', 'dummy.', None),
+    ('ip6_reverse_zone', '1.9.e.f.c.c.7.2.9.6.d.f.ip6.arpa.', True, 'ok', 'ip6.', None),
+    ('ip4_reverse_zone', '30.172.in-addr.arpa.', True, 'ok', 'ip4.', None),
+    ('classless_base_zone', '2.0.192.in-addr.arpa.', False, 'ok', 'classless-base.', None),
+    ('classless_zone_delegation_zone', '192/30.2.0.192.in-addr.arpa.', False, 'ok', 'classless.', None),
+    ('system_test_zone', 'system-test.', True, 'ok', 'system-test.', None),
+    # parent zone gives access to the dummy user, dummy user cannot manage ns records
+    ('parent_zone', 'parent.com.', False, 'ok', 'parent.',
+     [{'accessLevel': 'Delete', 'description': 'some_test_rule', 'userId': 'dummy'}])
+]
+
+
+def _conn(name):
+    return {
+        'name': name,
+        'keyName': VinylDNSTestContext.dns_key_name,
+        'key': VinylDNSTestContext.dns_key,
+        'primaryServer': VinylDNSTestContext.dns_ip
+    }
+
+
+def _zone_payload(name, shared, admin_group_id, conn_name, acl=None):
+    """
+    Builds a create zone request; the zone connection doubles as its transfer connection
+    """
+    conn = _conn(conn_name)
+    zone = {
+        'name': name,
+        'email': 'test@test.com',
+        'shared': shared,
+        'adminGroupId': admin_group_id,
+        'connection': conn,
+        'transferConnection': conn
+    }
+    if acl:
+        zone['acl'] = acl
+    return zone
+
+
+def zone_settings(zone):
+    """
+    The settings of a zone that tests change, in a form that compares equal between a create zone request
+    and the zone the api returns
+    """
+    rules = zone.get('acl', {}).get('rules', [])
+    acl = sorted((rule.get('accessLevel'), rule.get('description'), rule.get('userId'), rule.get('groupId'),
+                  rule.get('recordMask'), tuple(sorted(rule.get('recordTypes', []))))
+                 for rule in rules)
+    return zone['email'], zone.get('shared', False), zone['adminGroupId'], acl
+
+
+def clear_records_added_since_sync(client, zone):
+    """
+    Deletes the record sets created in a zone after its latest sync, which are the ones added through the api
+    rather than loaded from the dns server; the apex SOA and NS records are always left alone
+    """
+    latest_sync = zone.get('latestSync')
+    if not latest_sync:
+        return
+
+    to_delete = [(zone['id'], rs['id']) for rs in list_all_recordsets(client, zone['id'])
+                 if rs['created'] > latest_sync and
+                 not (rs['type'] in ('SOA', 'NS') and rs['name'] in ('@', zone['name']))]
+    clear_zoneid_rsid_tuple_list(to_delete, client)
+
+
+def _ensure_zone(client, spec, lookup=False):
+    """
+    Creates the zone in the spec, or with lookup reuses it if it already exists under the spec's admin group
+    :param lookup: True to look for an existing zone first, only worth a request when the context was restored
+    :return: a tuple of the zone and the create zone change, the change is None when the zone was reused
+    """
+    if lookup:
+        matches = client.list_zones(name_filter=spec['name'], max_items=100, status=200)['zones']
+        for existing in matches:
+            if existing['name'] == spec['name'] and existing['adminGroupId'] == spec['adminGroupId']:
+                return existing, None
+
+    zone_change = client.create_zone(spec, status=202)
+    return zone_change['zone'], zone_change
+
+
+class lazy_zone(object):
+    """
+    A shared zone that is only created, via SharedZoneTestContext.warm, the first time it is read.
+    The created zone is stored on the instance, which hides this descriptor from then on
+    """
+    def __init__(self, name):
+        self.name = name
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+
+        instance.warm([self.name])
+        return instance.__dict__[self.name]
+
+
 class SharedZoneTestContext(object):
     """
     Creates multiple zones to test authorization / access to shared zones across users
     """
+    ok_zone = lazy_zone('ok_zone')
+    dummy_zone = lazy_zone('dummy_zone')
+    ip6_reverse_zone = lazy_zone('ip6_reverse_zone')
+    ip4_reverse_zone = lazy_zone('ip4_reverse_zone')
+    classless_base_zone = lazy_zone('classless_base_zone')
+    classless_zone_delegation_zone = lazy_zone('classless_zone_delegation_zone')
+    system_test_zone = lazy_zone('system_test_zone')
+    parent_zone = lazy_zone('parent_zone')
+
     def __init__(self):
-        self.ok_vinyldns_client = VinylDNSClient(VinylDNSTestContext.vinyldns_url, 'okAccessKey', 'okSecretKey')
-        self.dummy_vinyldns_client = VinylDNSClient(VinylDNSTestContext.vinyldns_url, 'dummyAccessKey', 'dummySecretKey')
+        """
+        Sets up the shared groups; each shared zone is created the first time it is read, or all at once by warm
+        """
+        resolve_ahead(urlparse(VinylDNSTestContext.vinyldns_url).hostname)
+        resolve_ahead(VinylDNSTestContext.dns_ip.split(':')[0])
+
+        self.ok_vinyldns_client = VinylDNSClient(VinylDNSTestContext.vinyldns_url, 'okAccessKey', 'okSecretKey',
+                                                 session=shared_session)
+        self.dummy_vinyldns_client = VinylDNSClient(VinylDNSTestContext.vinyldns_url, 'dummyAccessKey', 'dummySecretKey',
+                                                    session=shared_session)
+        # both clients draw on the shared session, so one request warms the pool for them
+        open_connection(shared_session, VinylDNSTestContext.vinyldns_url)
 
         self.dummy_group = None
         self.ok_group = None
+        # every shared zone created so far, keyed by zone name
+        self.zones = {}
+
+        # no other run may be using the shared zones, they are about to be cleared or rebuilt
+        acquire_fixture_lock()
+
+        self.restored = self.restore_fixture()
 
-        self.tear_down() # ensures that the environment is clean before starting
+        # ensures that the environment is clean before starting, a session that finished cleanly needs nothing done
+        if not self.restored and not self.is_clean():
+            self.tear_down()
 
         try:
-            self.ok_group = self.ok_vinyldns_client.get_group("ok", status=200)
-            # in theory this shouldn't be needed, but getting 'user is not in group' errors on zone creation
-            self.confirm_member_in_group(self.ok_vinyldns_client, self.ok_group)
-
-            dummy_group = {
-                'name': 'dummy-group',
-                'email': 'test@test.com',
-                'description': 'this is a description',
-                'members': [ { 'id': 'dummy'} ],
-                'admins': [ { 'id': 'dummy'} ]
-            }
-            self.dummy_group = self.dummy_vinyldns_client.create_group(dummy_group, status=200)
-            # in theory this shouldn't be needed, but getting 'user is not in group' errors on zone creation
-            self.confirm_member_in_group(self.dummy_vinyldns_client, self.dummy_group)
-
-            ok_zone_change = self.ok_vinyldns_client.create_zone(
-                {
-                    'name': 'ok.',
-                    'email': 'test@test.com',
-                    'shared': False,
-                    'adminGroupId': self.ok_group['id'],
-                    'connection': {
-                        'name': 'ok.',
-                        'keyName': VinylDNSTestContext.dns_key_name,
-                        'key': VinylDNSTestContext.dns_key,
-                        'primaryServer': VinylDNSTestContext.dns_ip
-                    },
-                    'transferConnection': {
-                        'name': 'ok.',
-                        'keyName': VinylDNSTestContext.dns_key_name,
-                        'key': VinylDNSTestContext.dns_key,
-                        'primaryServer': VinylDNSTestContext.dns_ip
-                    }
-                }, status=202)
-            self.ok_zone = ok_zone_change['zone']
-
-            dummy_zone_change = self.dummy_vinyldns_client.create_zone(
-                {
-                    'name': 'dummy.',
-                    'email': 'test@test.com',
-                    'shared': False,
-                    'adminGroupId': self.dummy_group['id'],
-                    'connection': {
-                        'name': 'dummy.',
-                        'keyName': VinylDNSTestContext.dns_key_name,
-                        'key': VinylDNSTestContext.dns_key,
-                        'primaryServer': VinylDNSTestContext.dns_ip
-                    },
-                    'transferConnection': {
-                        'name': 'dummy.',
-                        'keyName': VinylDNSTestContext.dns_key_name,
-                        'key': VinylDNSTestContext.dns_key,
-                        'primaryServer': VinylDNSTestContext.dns_ip
-                    }
-                }, status=202)
-            self.dummy_zone = dummy_zone_change['zone']
-
-            ip6_reverse_zone_change = self.ok_vinyldns_client.create_zone(
-                {
-                    'name': '1.9.e.f.c.c.7.2.9.6.d.f.ip6.arpa.',
-                    'email': 'test@test.com',
-                    'shared': True,
-                    'adminGroupId': self.ok_group['id'],
-                    'connection': {
-                        'name': 'ip6.',
-                        'keyName': VinylDNSTestContext.dns_key_name,
-                        'key': VinylDNSTestContext.dns_key,
-                        'primaryServer': VinylDNSTestContext.dns_ip
-                    },
-                    'transferConnection': {
-                        'name': 'ip6.',
-                        'keyName': VinylDNSTestContext.dns_key_name,
-                        'key': VinylDNSTestContext.dns_key,
-                        'primaryServer': VinylDNSTestContext.dns_ip
-                    }
-                }, status=202
-            )
-            self.ip6_reverse_zone = ip6_reverse_zone_change['zone']
-
-            ip4_reverse_zone_change = self.ok_vinyldns_client.create_zone(
-                {
-                    'name': '30.172.in-addr.arpa.',
-                    'email': 'test@test.com',
-                    'shared': True,
-                    'adminGroupId': self.ok_group['id'],
-                    'connection': {
-                        'name': 'ip4.',
-                        'keyName': VinylDNSTestContext.dns_key_name,
-                        'key': VinylDNSTestContext.dns_key,
-                        'primaryServer': VinylDNSTestContext.dns_ip
-                    },
-                    'transferConnection': {
-                        'name': 'ip4.',
-                        'keyName': VinylDNSTestContext.dns_key_name,
-                        'key': VinylDNSTestContext.dns_key,
-                        'primaryServer': VinylDNSTestContext.dns_ip
-                    }
-                }, status=202
-            )
-            self.ip4_reverse_zone = ip4_reverse_zone_change['zone']
-
-            classless_base_zone_change = self.ok_vinyldns_client.create_zone(
-                {
-                    'name': '2.0.192.in-addr.arpa.',
-                    'email': 'test@test.com',
-                    'shared': False,
-                    'adminGroupId': self.ok_group['id'],
-                    'connection': {
-                        'name': 'classless-base.',
-                        'keyName': VinylDNSTestContext.dns_key_name,
-                        'key': VinylDNSTestContext.dns_key,
-                        'primaryServer': VinylDNSTestContext.dns_ip
-                    },
-                    'transferConnection': {
-                        'name': 'classless-base.',
-                        'keyName': VinylDNSTestContext.dns_key_name,
-                        'key': VinylDNSTestContext.dns_key,
-                        'primaryServer': VinylDNSTestContext.dns_ip
-                    }
-                }, status=202
-            )
-            self.classless_base_zone = classless_base_zone_change['zone']
-
-            classless_zone_delegation_change = self.ok_vinyldns_client.create_zone(
-                {
-                    'name': '192/30.2.0.192.in-addr.arpa.',
-                    'email': 'test@test.com',
-                    'shared': False,
-                    'adminGroupId': self.ok_group['id'],
-                    'connection': {
-                        'name': 'classless.',
-                        'keyName': VinylDNSTestContext.dns_key_name,
-                        'key': VinylDNSTestContext.dns_key,
-                        'primaryServer': VinylDNSTestContext.dns_ip
-                    },
-                    'transferConnection': {
-                        'name': 'classless.',
-                        'keyName': VinylDNSTestContext.dns_key_name,
-                        'key': VinylDNSTestContext.dns_key,
-                        'primaryServer': VinylDNSTestContext.dns_ip
-                    }
-                }, status=202
-            )
-            self.classless_zone_delegation_zone = classless_zone_delegation_change['zone']
-
-            system_test_zone_change = self.ok_vinyldns_client.create_zone(
-                {
-                    'name': 'system-test.',
-                    'email': 'test@test.com',
-                    'shared': True,
-                    'adminGroupId': self.ok_group['id'],
-                    'connection': {
-                        'name': 'system-test.',
-                        'keyName': VinylDNSTestContext.dns_key_name,
-                        'key': VinylDNSTestContext.dns_key,
-                        'primaryServer': VinylDNSTestContext.dns_ip
-                    },
-                    'transferConnection': {
-                        'name': 'system-test.',
-                        'keyName': VinylDNSTestContext.dns_key_name,
-                        'key': VinylDNSTestContext.dns_key,
-                        'primaryServer': VinylDNSTestContext.dns_ip
-                    }
-                }, status=202
-            )
-            self.system_test_zone = system_test_zone_change['zone']
-
-            # parent zone gives access to the dummy user, dummy user cannot manage ns records
-            parent_zone_change = self.ok_vinyldns_client.create_zone(
-                {
-                    'name': 'parent.com.',
+            if self.restored:
+                self.scrub()
+            else:
+                self.ok_group = self.ok_vinyldns_client.get_group("ok", status=200)
+                # in theory this shouldn't be needed, but getting 'user is not in group' errors on zone creation
+                self.confirm_member_in_group(self.ok_vinyldns_client, self.ok_group)
+
+                dummy_group = {
+                    'name': 'dummy-group',
                     'email': 'test@test.com',
-                    'shared': False,
-                    'adminGroupId': self.ok_group['id'],
-                    'acl': {
-                        'rules': [
-                            {
-                                'accessLevel': 'Delete',
-                                'description': 'some_test_rule',
-                                'userId': 'dummy'
-                            }
-                        ]
-                    },
-                    'connection': {
-                        'name': 'parent.',
-                        'keyName': VinylDNSTestContext.dns_key_name,
-                        'key': VinylDNSTestContext.dns_key,
-                        'primaryServer': VinylDNSTestContext.dns_ip
-                    },
-                    'transferConnection': {
-                        'name': 'parent.',
-                        'keyName': VinylDNSTestContext.dns_key_name,
-                        'key': VinylDNSTestContext.dns_key,
-                        'primaryServer': VinylDNSTestContext.dns_ip
-                    }
-                }, status=202)
-            self.parent_zone = parent_zone_change['zone']
-
-            # wait until our zones are created
-            self.ok_vinyldns_client.wait_until_zone_exists(system_test_zone_change)
-            self.ok_vinyldns_client.wait_until_zone_exists(ok_zone_change)
-            self.dummy_vinyldns_client.wait_until_zone_exists(dummy_zone_change)
-            self.ok_vinyldns_client.wait_until_zone_exists(ip6_reverse_zone_change)
-            self.ok_vinyldns_client.wait_until_zone_exists(ip4_reverse_zone_change)
-            self.ok_vinyldns_client.wait_until_zone_exists(classless_base_zone_change)
-            self.ok_vinyldns_client.wait_until_zone_exists(classless_zone_delegation_change)
-            self.ok_vinyldns_client.wait_until_zone_exists(system_test_zone_change)
-            self.ok_vinyldns_client.wait_until_zone_exists(parent_zone_change)
-
-            # validate all in there
-            zones = self.dummy_vinyldns_client.list_zones()['zones']
-            assert_that(len(zones), is_(2))
-            zones = self.ok_vinyldns_client.list_zones()['zones']
-            assert_that(len(zones), is_(7))
+                    'description': 'this is a description',
+                    'members': [ { 'id': 'dummy'} ],
+                    'admins': [ { 'id': 'dummy'} ]
+                }
+                self.dummy_group = self.dummy_vinyldns_client.create_group(dummy_group, status=200)
+                # in theory this shouldn't be needed, but getting 'user is not in group' errors on zone creation
+                self.confirm_member_in_group(self.dummy_vinyldns_client, self.dummy_group)
+
+                self.save_fixture()
 
         except:
             # teardown if there was any issue in setup
@@ -239,8 +305,73 @@ class SharedZoneTestContext(object):
                 self.tear_down()
             except:
                 pass
+            release_fixture_lock()
             raise
 
+    @classmethod
+    def zone_names(cls):
+        return [spec[0] for spec in ZONE_SPECS]
+
+    def zone_requests(self):
+        """
+        The client and create zone request for each shared zone, keyed by the attribute the zone is stored under
+        """
+        clients = {'ok': self.ok_vinyldns_client, 'dummy': self.dummy_vinyldns_client}
+        groups = {'ok': self.ok_group, 'dummy': self.dummy_group}
+
+        zone_requests = {}
+        for attr, name, shared, owner, conn_name, rules in ZONE_SPECS:
+            acl = {'rules': rules} if rules else None
+            zone_requests[attr] = (clients[owner],
+                                   _zone_payload(name, shared, groups[owner]['id'], conn_name, acl=acl))
+        return zone_requests
+
+    def warm(self, names=None):
+        """
+        Creates any of the given shared zones that have not been created yet
+        :param names: the attributes of the zones to create, defaults to all of the shared zones
+        """
+        zone_requests = self.zone_requests()
+        full = names is None
+        names = [name for name in (names or zone_requests) if name not in vars(self)]
+        if not names:
+            return
+
+        # finding or creating each zone is independent of the others, so submit them all at once and join on the results;
+        # a zone can only already exist when an interrupted run was restored, otherwise it is created directly
+        with ThreadPoolExecutor(max_workers=len(names)) as executor:
+            futures = dict((name, executor.submit(_ensure_zone, *zone_requests[name], lookup=self.restored))
+                           for name in names)
+        ensured = dict((name, future.result()) for name, future in iteritems(futures))
+
+        # wait until the zones we had to create exist, polling for all of them at the same time
+        pending = [name for name, (zone, zone_change) in iteritems(ensured) if zone_change]
+        if pending:
+            with ThreadPoolExecutor(max_workers=len(pending)) as executor:
+                list(executor.map(lambda name: zone_requests[name][0].wait_until_zone_exists(ensured[name][1]),
+                                  pending))
+
+        for name, (zone, zone_change) in iteritems(ensured):
+            self.store_zone(name, zone)
+
+        self.save_fixture()
+
+        # validate all in there; a full warm runs from the fixture, before any test adds zones of its own
+        if full:
+            zones = self.dummy_vinyldns_client.list_zones()['zones']
+            assert len(zones) == 2, zones
+            zones = self.ok_vinyldns_client.list_zones()['zones']
+            assert len(zones) == 7, zones
+
+    def store_zone(self, attr, zone):
+        setattr(self, attr, zone)
+        self.zones[zone['name']] = zone
+
+    def created_zones(self):
+        """
+        The shared zones created so far, keyed by the attribute they are stored under
+        """
+        return dict((name, vars(self)[name]) for name in self.zone_names() if name in vars(self))
 
     def tear_down(self):
         """
@@ -249,27 +380,196 @@ class SharedZoneTestContext(object):
         We shouldn't have to do any checks now, as zone admins have full rights to all zones, including
         deleting all records (even in the old shared model)
         """
-        clear_zones(self.dummy_vinyldns_client)
-        clear_zones(self.ok_vinyldns_client)
+        # the two users administer disjoint zones, so their zones can be cleared at the same time
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            cleared = [executor.submit(clear_zones, self.dummy_vinyldns_client),
+                       executor.submit(clear_zones, self.ok_vinyldns_client)]
+        for result in cleared:
+            result.result()
+
+        # groups go one user after the other, a group both users administer would otherwise be deleted twice
         clear_groups(self.dummy_vinyldns_client)
         clear_groups(self.ok_vinyldns_client, exclude=['ok'])
 
         # reset ok_group
-        ok_group = {
-            'id': 'ok',
-            'name': 'ok',
-            'email': 'test@test.com',
-            'description': 'this is a description',
-            'members': [ { 'id': 'ok'} ],
-            'admins': [ { 'id': 'ok'} ]
+        self.ok_vinyldns_client.update_group(_OK_GROUP['id'], _OK_GROUP, status=200)
+
+        # nothing recorded by a previous run survives a tear down
+        self.forget_fixture()
+
+    def is_clean(self):
+        """
+        Checks that neither user administers any zones, that the dummy user is in no groups and that the
+        ok user is only in the ok group, as tear_down leaves it
+        """
+        if self.dummy_vinyldns_client.list_all_my_groups(status=200):
+            return False
+
+        ok_groups = self.ok_vinyldns_client.list_all_my_groups(status=200)
+        if len(ok_groups) != 1:
+            return False
+
+        ok_group = ok_groups[0]
+        ok_group_reset = all(ok_group.get(key) == _OK_GROUP[key] for key in ('id', 'name', 'email', 'description')) and \
+            [member['id'] for member in ok_group['members']] == [member['id'] for member in _OK_GROUP['members']] and \
+            [admin['id'] for admin in ok_group['admins']] == [admin['id'] for admin in _OK_GROUP['admins']]
+        if not ok_group_reset:
+            return False
+
+        # the dummy user has no groups left to administer a zone with, only the ok user's zones need checking
+        zones = self.ok_vinyldns_client.list_zones(status=200)['zones']
+        return not [zone for zone in zones if zone['adminGroupId'] == 'ok' or zone['account'] == 'ok']
+
+    def scrub(self):
+        """
+        Clears away what the interrupted run left around the restored zones and groups: zones that are not
+        shared zones, groups other than the ok and dummy groups, changes to the ok group and any record sets
+        added to the restored zones after they were synced
+        """
+        spec_zones = set((zone['name'], zone['adminGroupId']) for client, zone in self.zone_requests().values())
+
+        def scrub_zones(client):
+            group_ids = [group['id'] for group in client.list_all_my_groups(status=200)]
+            zones = client.list_zones(status=200)['zones']
+            client.abandon_zones([zone['id'] for zone in zones
+                                  if (zone['adminGroupId'] in group_ids or zone['account'] in group_ids) and
+                                  (zone['name'], zone['adminGroupId']) not in spec_zones])
+
+        # zones go first, a group cannot be deleted while it is still the admin group of a zone
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            scrubbed = [executor.submit(scrub_zones, self.dummy_vinyldns_client),
+                        executor.submit(scrub_zones, self.ok_vinyldns_client)]
+        for result in scrubbed:
+            result.result()
+
+        # groups go one user after the other, a group both users administer would otherwise be deleted twice
+        clear_groups(self.dummy_vinyldns_client, exclude=[self.dummy_group['id']])
+        clear_groups(self.ok_vinyldns_client, exclude=[self.ok_group['id']])
+
+        self.ok_group = self.ok_vinyldns_client.update_group(_OK_GROUP['id'], _OK_GROUP, status=200)
+
+        # put back any settings the interrupted run changed on the restored zones, acl rules included
+        zone_requests = self.zone_requests()
+        reset_changes = {}
+        for name, zone in iteritems(self.created_zones()):
+            client, spec = zone_requests[name]
+            if zone_settings(zone) != zone_settings(spec):
+                reset = dict(spec, id=zone['id'], acl=spec.get('acl', {'rules': []}))
+                reset_changes[name] = client.update_zone(reset, status=202)
+        for name, zone_change in iteritems(reset_changes):
+            zone_requests[name][0].wait_until_zone_change_status(zone_change, 'Complete')
+            self.store_zone(name, zone_change['zone'])
+
+        for client, zone in self.shared_zones():
+            clear_records_added_since_sync(client, zone)
+
+    def restore_fixture(self):
+        """
+        Picks up the zones and groups recorded by an earlier run that was interrupted before tearing down.
+        Every recorded zone and group is looked up first; if any of them is gone the full setup has to run
+        :return: True if the recorded zones and groups were restored
+        """
+        if not os.path.exists(FIXTURE_FILE):
+            return False
+
+        try:
+            with open(FIXTURE_FILE) as f:
+                fixture = json.load(f)
+        except (IOError, ValueError):
+            return False
+
+        if fixture.get('url') != VinylDNSTestContext.vinyldns_url:
+            return False
+
+        ok_group = self.ok_vinyldns_client.get_group(fixture['ok_group']['id'], status=(200, 404))
+        dummy_group = self.dummy_vinyldns_client.get_group(fixture['dummy_group']['id'], status=(200, 404))
+        if not isinstance(ok_group, dict) or not isinstance(dummy_group, dict):
+            return False
+
+        zones = {}
+        for name, zone in iteritems(fixture['zones']):
+            if zone['adminGroupId'] == dummy_group['id']:
+                client = self.dummy_vinyldns_client
+            else:
+                client = self.ok_vinyldns_client
+
+            result = client.get_zone(zone['id'], status=(200, 404))
+            if not isinstance(result, dict) or result['zone']['name'] != zone['name']:
+                return False
+            zones[name] = result['zone']
+
+        self.ok_group = ok_group
+        self.dummy_group = dummy_group
+        for name, zone in iteritems(zones):
+            self.store_zone(name, zone)
+
+        return True
+
+    def save_fixture(self):
+        """
+        Records the groups and zones built by this run
+        """
+        fixture = {
+            'url': VinylDNSTestContext.vinyldns_url,
+            'ok_group': self.ok_group,
+            'dummy_group': self.dummy_group,
+            'zones': self.created_zones()
         }
-        self.ok_vinyldns_client.update_group(ok_group['id'], ok_group, status=200)
+        with open(FIXTURE_FILE, 'w') as f:
+            json.dump(fixture, f)
+
+    def forget_fixture(self):
+        """
+        Forgets the recorded zones and groups
+        """
+        if os.path.exists(FIXTURE_FILE):
+            os.remove(FIXTURE_FILE)
+
+    def release_lock(self):
+        """
+        Hands the shared zones back once this run is done with them
+        """
+        release_fixture_lock()
+
+    def shared_zones(self):
+        """
+        Pairs each shared zone created so far with the client that administers it
+        """
+        return [(self.dummy_vinyldns_client if zone['adminGroupId'] == self.dummy_group['id']
+                 else self.ok_vinyldns_client, zone)
+                for zone in self.created_zones().values()]
+
+    def snapshot_records(self):
+        """
+        Captures the ids of the record sets currently in each shared zone, keyed by zone id
+        """
+        snapshot = {}
+        for client, zone in self.shared_zones():
+            snapshot[zone['id']] = set(rs['id'] for rs in list_all_recordsets(client, zone['id']))
+        return snapshot
+
+    def reset_records_only(self, snapshot):
+        """
+        Deletes any record sets added to the shared zones since the snapshot was taken, leaving the zones
+        and groups in place so they do not have to be rebuilt
+        """
+        for client, zone in self.shared_zones():
+            # a zone created after the snapshot has no baseline, and its apex records must not be deleted
+            if zone['id'] not in snapshot:
+                continue
+
+            baseline = snapshot[zone['id']]
+            to_delete = [(zone['id'], rs['id']) for rs in list_all_recordsets(client, zone['id'])
+                         if rs['id'] not in baseline]
+            clear_zoneid_rsid_tuple_list(to_delete, client)
 
     def confirm_member_in_group(self, client, group):
-        retries = 2
-        success = group in client.list_all_my_groups(status=200)
-        while retries >= 0 and not success:
-            success = group in client.list_all_my_groups(status=200)
-            time.sleep(.05)
-            retries -= 1
-        assert_that(success, is_(True))
+        # check straight away, then back off exponentially between any further checks
+        success = False
+        for delay in (0, 0.01, 0.02, 0.04, 0.08):
+            if delay:
+                time.sleep(delay)
+            if group['id'] in set(my_group['id'] for my_group in client.list_all_my_groups(status=200)):
+                success = True
+                break
+        assert success, 'user is not a member of group {0}'.format(group['id'])
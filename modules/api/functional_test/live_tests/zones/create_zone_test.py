@@ -6,6 +6,8 @@ from vinyldns_python import VinylDNSClient
 from vinyldns_context import VinylDNSTestContext
 from utils import *
 
+LAZY_SHARED_ZONES = True
+
 records_in_dns = [
     {'name': 'one-time.',
      'type': 'SOA',
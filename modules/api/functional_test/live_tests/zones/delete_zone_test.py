@@ -6,6 +6,8 @@ from vinyldns_python import VinylDNSClient
 from vinyldns_context import VinylDNSTestContext
 from utils import *
 
+LAZY_SHARED_ZONES = True
+
 
 def test_delete_zone_success(shared_zone_test_context):
     """
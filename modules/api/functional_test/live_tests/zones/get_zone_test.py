@@ -6,6 +6,8 @@ from vinyldns_python import VinylDNSClient
 from vinyldns_context import VinylDNSTestContext
 from utils import *
 
+LAZY_SHARED_ZONES = True
+
 
 def test_get_zone_by_id(shared_zone_test_context):
     """
@@ -2,6 +2,8 @@ from hamcrest import *
 from utils import *
 from vinyldns_python import VinylDNSClient
 
+LAZY_SHARED_ZONES = True
+
 
 def check_zone_changes_page_accuracy(results, expected_first_change, expected_num_results):
     assert_that(len(results), is_(expected_num_results))
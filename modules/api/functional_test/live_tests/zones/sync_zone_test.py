@@ -4,6 +4,8 @@ from vinyldns_context import VinylDNSTestContext
 from utils import *
 import time
 
+LAZY_SHARED_ZONES = True
+
 records_in_dns = [
     {'name': 'sync-test.',
      'type': 'SOA',
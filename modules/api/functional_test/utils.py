@@ -503,6 +503,21 @@ def get_recordset_json(zone, rname, type, rdata_list, ttl=200):
     }
     return json
 
+def list_all_recordsets(client, zone_id):
+    """
+    Pages through all of the record sets in a zone
+    :param client: a client with read access to the zone
+    :param zone_id: the id of the zone
+    :return: a list containing every record set in the zone
+    """
+    result = client.list_recordsets(zone_id, status=200)
+    recordsets = result['recordSets']
+    while 'nextId' in result:
+        result = client.list_recordsets(zone_id, start_from=result['nextId'], status=200)
+        recordsets.extend(result['recordSets'])
+
+    return recordsets
+
 def clear_recordset_list(to_delete, client):
     delete_changes = []
     for result_rs in to_delete:
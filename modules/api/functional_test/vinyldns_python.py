@@ -1,7 +1,7 @@
-import json
 import time
 import logging
 import collections
+from concurrent.futures import ThreadPoolExecutor
 
 import requests
 from requests.adapters import HTTPAdapter
@@ -17,6 +17,12 @@ from builtins import str
 from future.utils import iteritems
 from future.moves.urllib.parse import parse_qs
 
+try:
+    # ujson does the encoding and decoding in C, far quicker than the stdlib json on python 2
+    import ujson as json
+except ImportError:
+    import json
+
 try:
     basestring
 except NameError:
@@ -29,9 +35,13 @@ __all__ = [u'VinylDNSClient', u'MAX_RETRIES', u'RETRY_WAIT']
 MAX_RETRIES = 30
 RETRY_WAIT = 0.05
 
+# deletes are fanned out over this many threads, the connection pool is sized so they do not queue for a connection
+MAX_ABANDON_WORKERS = 16
+POOL_MAXSIZE = 32
+
 class VinylDNSClient(object):
 
-    def __init__(self, url, access_key, secret_key):
+    def __init__(self, url, access_key, secret_key, session=None):
         self.index_url = url
         self.headers = {
             u'Accept': u'application/json, text/plain',
@@ -41,8 +51,9 @@ class VinylDNSClient(object):
         self.signer = BotoRequestSigner(self.index_url,
                                         access_key, secret_key)
 
-        self.session = self.requests_retry_session()
-        self.session_not_found_ok = self.requests_retry_not_found_ok_session()
+        # a session can be shared between clients so that they draw from the same connection pool
+        self.session = session or self.requests_retry_session()
+        self.session_not_found_ok = session or self.requests_retry_not_found_ok_session()
 
     def requests_retry_not_found_ok_session(self,
                                             retries=5,
@@ -58,16 +69,18 @@ class VinylDNSClient(object):
             backoff_factor=backoff_factor,
             status_forcelist=status_forcelist,
         )
-        adapter = HTTPAdapter(max_retries=retry)
+        adapter = HTTPAdapter(max_retries=retry, pool_maxsize=POOL_MAXSIZE)
         session.mount(u'http://', adapter)
         session.mount(u'https://', adapter)
         return session
 
-    def requests_retry_session(self,
-                               retries=5,
+    @staticmethod
+    def requests_retry_session(retries=5,
                                backoff_factor=0.4,
                                status_forcelist=(500, 502, 504),
                                session=None,
+                               pool_connections=10,
+                               pool_maxsize=POOL_MAXSIZE,
                                ):
         session = session or requests.Session()
         retry = Retry(
@@ -77,7 +90,7 @@ class VinylDNSClient(object):
             backoff_factor=backoff_factor,
             status_forcelist=status_forcelist,
         )
-        adapter = HTTPAdapter(max_retries=retry)
+        adapter = HTTPAdapter(max_retries=retry, pool_connections=pool_connections, pool_maxsize=pool_maxsize)
         session.mount(u'http://', adapter)
         session.mount(u'https://', adapter)
         return session
@@ -121,7 +134,7 @@ class VinylDNSClient(object):
                 assert_that(response.status_code, is_(status_code))
 
         try:
-            return response.status_code, response.json()
+            return response.status_code, json.loads(response.content)
         except:
             return response.status_code, response.text
 
@@ -787,13 +800,18 @@ class VinylDNSClient(object):
         return response == 200
 
     def abandon_zones(self, zone_ids, **kwargs):
-        #delete each zone
-        for zone_id in zone_ids:
+        if not zone_ids:
+            return
+
+        # delete each zone and wait until it is gone, working through the zones concurrently
+        def abandon_zone(zone_id):
             self.delete_zone(zone_id, status=(202, 404))
+            return self.wait_until_zone_deleted(zone_id)
+
+        with ThreadPoolExecutor(max_workers=min(MAX_ABANDON_WORKERS, len(zone_ids))) as executor:
+            results = list(executor.map(abandon_zone, zone_ids))
 
-        # Wait until each zone is gone
-        for zone_id in zone_ids:
-            success = self.wait_until_zone_deleted(zone_id)
+        for success in results:
             assert_that(success, is_(True))
 
     def wait_until_recordset_change_status(self, rs_change, expected_status):